@@ -8,7 +8,6 @@
 import os
 import time
 import logging
-import re
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -109,12 +108,7 @@ class DomainFrequencyProcessor:
             hostname = parsed.hostname
             
             if hostname:
-                # 检查是否为IP地址
-                ip_pattern = r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-                if re.match(ip_pattern, hostname):
-                    return hostname  # 返回IP地址
-                else:
-                    return hostname  # 返回域名
+                return hostname  # 域名和IP地址都直接使用hostname
             
             return url  # 如果解析失败，返回原URL作为fallback
             
@@ -329,6 +323,7 @@ class ProcessorConfig:
     enable_validation: bool = True       # 是否启用链接验证
     enable_cache: bool = True            # 是否启用搜索缓存
     min_valid_links: int = 5             # 每个频道最少有效链接数，达到后停止验证
+    validation_workers: int = 16         # 链接验证并发数（网络I/O为主，与频道并发数分开配置）
     
     def to_search_config(self) -> SearchConfig:
         """转换为搜索器配置"""
@@ -338,7 +333,7 @@ class ProcessorConfig:
             min_resolution=self.min_resolution,
             enable_validation=self.enable_validation,
             enable_cache=self.enable_cache,
-            concurrent_workers=self.max_workers_per_group,
+            concurrent_workers=self.validation_workers,
             min_valid_links=self.min_valid_links
         )
 
@@ -410,12 +405,12 @@ class ModularBatchProcessor:
             List[IPTVChannel]: 找到的有效频道列表
         """
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # 使用搜索器搜索频道
             channels = self.searcher.search_channels(channel_name)
             
-            search_time = time.time() - start_time
+            search_time = time.perf_counter() - start_time
             
             if channels:
                 logger.info(f"    ✓ {channel_name}: {len(channels)} 个有效链接 ({search_time:.2f}s)")
@@ -500,12 +495,12 @@ class ModularBatchProcessor:
         for i, group in enumerate(groups, 1):
             logger.info(f"处理分组 {i}/{len(groups)}: {group.name} ({len(group.channels)} 个频道)")
             
-            group_start_time = time.time()
+            group_start_time = time.perf_counter()
             
             # 并发处理分组内的频道
             group_result = self.process_group_concurrent(group)
             
-            group_time = time.time() - group_start_time
+            group_time = time.perf_counter() - group_start_time
             valid_count = sum(len(channels) for channels in group_result.values())
             
             logger.info(f"    分组 {group.name} 完成: {valid_count} 个有效链接 ({group_time:.2f}s)")
@@ -516,7 +511,7 @@ class ModularBatchProcessor:
     
     def run(self):
         """运行批量处理"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         print("=" * 60)
         print("模块化IPTV频道批量搜索和链接提取工具")
@@ -587,7 +582,7 @@ class ModularBatchProcessor:
                 all_results, self.config.output_file, groups
             )
             
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             
             logger.info("=" * 60)
             logger.info("批量处理完成")
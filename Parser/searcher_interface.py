@@ -6,9 +6,13 @@ IPTV搜索器接口定义
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional
 from dataclasses import dataclass
+from functools import lru_cache
+from collections import OrderedDict
 import logging
+import re
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -33,17 +37,26 @@ class IPTVChannel:
         
         # 标准化分辨率格式
         if self.resolution and self.resolution != "未知":
-            # 提取数字部分作为高度
-            import re
-            match = re.search(r'(\d+)', self.resolution)
-            if match:
-                height = int(match.group(1))
-                if height >= 1080:
-                    self.quality = "高清"
-                elif height >= 720:
-                    self.quality = "标清"
-                else:
-                    self.quality = "普清"
+            quality = _quality_from_resolution(self.resolution)
+            if quality:
+                self.quality = quality
+
+
+@lru_cache(maxsize=256)
+def _quality_from_resolution(resolution: str) -> Optional[str]:
+    """根据分辨率字符串推断画质描述 - 分辨率取值很少，结果按字符串缓存"""
+    # 提取数字部分作为高度
+    match = re.search(r'(\d+)', resolution)
+    if not match:
+        return None
+    
+    height = int(match.group(1))
+    if height >= 1080:
+        return "高清"
+    elif height >= 720:
+        return "标清"
+    else:
+        return "普清"
 
 
 @dataclass 
@@ -57,6 +70,10 @@ class SearchConfig:
     max_pages: int = 2            # 最大搜索页数 - 限制为2页，第3页数据过旧
     concurrent_workers: int = 16   # 并发线程数 - 从6增加到16
     min_valid_links: int = 5       # 每个频道最少有效链接数 
+    cache_ttl: int = 1800          # 搜索缓存有效期(秒)，过期后重新搜索
+    validation_cache_ttl: int = 300  # 链接验证结果缓存有效期(秒)，同一链接在不同关键词下重复出现时直接复用
+    cache_maxsize: int = 512       # 搜索缓存最多保留的关键词数，超出后淘汰最久未使用的
+    validation_cache_maxsize: int = 4096  # 验证结果缓存最多保留的链接数
 
 
 class BaseIPTVSearcher(ABC):
@@ -76,7 +93,14 @@ class BaseIPTVSearcher(ABC):
         if not hasattr(self, 'base_url'):
             self.base_url = ""
         
-        self._search_cache = {} if self.config.enable_cache else None
+        # 缓存按最近使用顺序排列，超出容量时从头部淘汰；验证线程和搜索线程共用，读写加锁
+        self._search_cache = OrderedDict() if self.config.enable_cache else None
+        self._validation_cache = OrderedDict() if self.config.enable_cache else None
+        self._cache_lock = threading.Lock()
+        
+        # 链接验证共用的线程池，首次验证时创建
+        self._validation_executor = None
+        self._executor_lock = threading.Lock()
         
         # 子类需要设置的属性
         self._setup_session()
@@ -127,6 +151,57 @@ class BaseIPTVSearcher(ABC):
         """
         pass
     
+    def _validate_link_cached(self, channel: IPTVChannel) -> bool:
+        """验证链接有效性，按URL缓存验证结果，有效期内不再重复请求"""
+        if self._validation_cache is None:
+            return self._validate_link(channel)
+        
+        is_valid = self._cache_get(self._validation_cache, channel.url, self.config.validation_cache_ttl)
+        if is_valid is not None:
+            return is_valid
+        
+        is_valid = self._validate_link(channel)
+        self._cache_put(self._validation_cache, channel.url, is_valid, self.config.validation_cache_maxsize)
+        return is_valid
+    
+    def _cache_get(self, cache: OrderedDict, key: str, ttl: int):
+        """
+        读取带有效期的LRU缓存
+        
+        Returns:
+            缓存的值；未命中或已过期时返回None（过期条目同时删除）
+        """
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            cached_time, value = entry
+            if time.monotonic() - cached_time >= ttl:
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+            return value
+    
+    def _cache_put(self, cache: OrderedDict, key: str, value, maxsize: int):
+        """写入LRU缓存，超出容量时淘汰最久未使用的条目"""
+        with self._cache_lock:
+            cache[key] = (time.monotonic(), value)
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+    
+    def _get_validation_executor(self) -> ThreadPoolExecutor:
+        """获取共享的验证线程池，避免每页验证都重新创建线程"""
+        if self._validation_executor is None:
+            with self._executor_lock:
+                if self._validation_executor is None:
+                    max_workers = min(self.config.concurrent_workers, 16)
+                    self._validation_executor = ThreadPoolExecutor(
+                        max_workers=max_workers,
+                        thread_name_prefix="validate"
+                    )
+        return self._validation_executor
+    
     def _validate_links_concurrent(self, channels: List[IPTVChannel], remaining_needed: int = None) -> List[IPTVChannel]:
         """
         并发验证多个链接的有效性，达到目标数量后停止
@@ -143,23 +218,22 @@ class BaseIPTVSearcher(ABC):
             return channels[:needed]  # 如果不验证，也返回限定数量
         
         valid_channels = []
-        # 增加并发数，提高验证效率
-        max_workers = min(self.config.concurrent_workers, len(channels), 16)  # 从8增加到16
         target_count = remaining_needed if remaining_needed is not None else self.config.min_valid_links
         
         logger.info(f"[{self.site_name}] 开始并发验证 {len(channels)} 个链接 (目标: {target_count} 个有效链接)")
         
-        executor = ThreadPoolExecutor(max_workers=max_workers)
+        executor = self._get_validation_executor()
+        future_to_channel = {}
         try:
             # 提交验证任务
             future_to_channel = {
-                executor.submit(self._validate_link, channel): channel
+                executor.submit(self._validate_link_cached, channel): channel
                 for channel in channels
             }
             
             # 收集验证结果，达到目标数量后停止
             completed_count = 0
-            start_time = time.time()
+            start_time = time.monotonic()  # 单调时钟，不受系统时间调整影响
             should_exit = False
             
             for future in as_completed(future_to_channel, timeout=18):  # 增加总超时到18秒
@@ -173,23 +247,24 @@ class BaseIPTVSearcher(ABC):
                     is_valid = future.result(timeout=8)  # 单个任务超时8秒，给质量验证足够时间
                     if is_valid:
                         valid_channels.append(channel)
-                        logger.debug(f"[{self.site_name}] 验证通过: {channel.name} - {channel.url[:50]}...")
+                        logger.debug("[%s] 验证通过: %s - %s...", self.site_name, channel.name, channel.url[:50])
                         
                         # 检查是否达到目标数量
                         if len(valid_channels) >= target_count:
                             should_exit = True  # 标记需要退出，但继续处理当前批次
                             
                 except Exception as e:
-                    logger.debug(f"[{self.site_name}] 验证异常 {channel.url}: {e}")
+                    logger.debug("[%s] 验证异常 %s: %s", self.site_name, channel.url, e)
+                
+                elapsed = time.monotonic() - start_time
                 
                 # 每3个显示一次进度
                 if completed_count % 3 == 0:
-                    elapsed = time.time() - start_time
                     logger.info(f"[{self.site_name}] 验证进度: {len(valid_channels)}个有效/{completed_count}个已验证 ({elapsed:.1f}s)")
                 
                 # 超时保护 - 如果超过15秒还没完成，直接返回已找到的结果
-                if time.time() - start_time > 15:
-                    logger.info(f"[{self.site_name}] 验证超时({time.time() - start_time:.1f}s)，返回已找到的 {len(valid_channels)} 个有效链接")
+                if elapsed > 15:
+                    logger.info(f"[{self.site_name}] 验证超时({elapsed:.1f}s)，返回已找到的 {len(valid_channels)} 个有效链接")
                     should_exit = True
                     break
                     
@@ -201,15 +276,9 @@ class BaseIPTVSearcher(ABC):
             logger.warning(f"[{self.site_name}] 并发验证超时或异常: {e}")
             # 如果并发验证失败，返回已经验证的结果
         finally:
-            # 正确关闭executor，等待已提交的任务完成但不等太久
-            try:
-                executor.shutdown(wait=True)
-                # 等待最多2秒让正在执行的任务完成
-                import concurrent.futures
-                if not executor._threads:  # 如果没有线程，直接继续
-                    pass
-            except:
-                executor.shutdown(wait=False)
+            # 取消尚未开始的验证任务；正在执行的任务在共享线程池中自行结束，不阻塞返回
+            for future in future_to_channel:
+                future.cancel()
         
         # 统一的结果日志
         result_count = len(valid_channels)
@@ -233,12 +302,14 @@ class BaseIPTVSearcher(ABC):
         Returns:
             List[IPTVChannel]: 搜索结果
         """
-        # 检查缓存
-        if self._search_cache and keyword in self._search_cache:
-            logger.info(f"[{self.site_name}] 使用缓存结果: {keyword}")
-            # 使用与搜索逻辑一致的目标计数
-            target_count = self.config.min_valid_links if self.config.enable_validation else self.config.max_results
-            return self._search_cache[keyword][:target_count]
+        # 检查缓存（已过期的条目在读取时删除，重新搜索）
+        if self._search_cache is not None:
+            cached_channels = self._cache_get(self._search_cache, keyword, self.config.cache_ttl)
+            if cached_channels is not None:
+                logger.info(f"[{self.site_name}] 使用缓存结果: {keyword}")
+                # 使用与搜索逻辑一致的目标计数
+                target_count = self.config.min_valid_links if self.config.enable_validation else self.config.max_results
+                return cached_channels[:target_count]
         
         logger.info(f"[{self.site_name}] 开始搜索: {keyword}")
         
@@ -269,9 +340,13 @@ class BaseIPTVSearcher(ABC):
                     remaining_needed = max(0, self.config.min_valid_links - len(all_channels))
                     
                     if remaining_needed > 0:
-                        # 先过滤掉已经验证过的重复链接
+                        # 先过滤掉已经验证过的重复链接，同页内重复链接只保留首次出现的
                         existing_urls = {ch.url for ch in all_channels}
-                        new_channels = [ch for ch in page_channels if ch.url not in existing_urls]
+                        page_unique = {}
+                        for ch in page_channels:
+                            if ch.url not in existing_urls:
+                                page_unique.setdefault(ch.url, ch)
+                        new_channels = list(page_unique.values())
                         
                         if new_channels:
                             logger.info(f"[{self.site_name}] 第 {page} 页: {len(page_channels)} 个链接，过滤重复后 {len(new_channels)} 个待验证")
@@ -328,8 +403,8 @@ class BaseIPTVSearcher(ABC):
             logger.info(f"[{self.site_name}] 搜索完成: {keyword}, 找到 {len(final_channels)} 个有效频道 [达标]")
         
         # 缓存结果
-        if self._search_cache:
-            self._search_cache[keyword] = final_channels
+        if self._search_cache is not None:
+            self._cache_put(self._search_cache, keyword, final_channels, self.config.cache_maxsize)
         
         return final_channels
     
@@ -342,9 +417,11 @@ class BaseIPTVSearcher(ABC):
         }
     
     def clear_cache(self):
-        """清空缓存"""
-        if self._search_cache:
-            self._search_cache.clear()
+        """清空缓存（搜索结果和链接验证结果）"""
+        if self._search_cache is not None:
+            with self._cache_lock:
+                self._search_cache.clear()
+                self._validation_cache.clear()
             logger.info(f"[{self.site_name}] 缓存已清空")
 
 
@@ -362,7 +439,12 @@ class SearcherFactory:
             name: 搜索器名称
             searcher_class: 搜索器类
         """
+        # 模块被重新加载、或先作为__main__运行再按模块名导入时，会得到同名的新类对象；
+        # 按类的限定名判断是否为同一个搜索器，只更新为最新的类，不重复记录注册日志
+        existing = cls._searchers.get(name)
         cls._searchers[name] = searcher_class
+        if existing is not None and existing.__qualname__ == searcher_class.__qualname__:
+            return
         logger.info(f"搜索器已注册: {name}")
     
     @classmethod
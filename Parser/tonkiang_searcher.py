@@ -2,13 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import requests
+import urllib3
+import ssl
 import time
 import random
+import math
 import re
 import logging
-from typing import List, Optional
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import threading
+from urllib.parse import urljoin, urlsplit
+from typing import List, Optional, Tuple
+from functools import lru_cache
+from bs4 import BeautifulSoup, CData, NavigableString
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -16,16 +21,123 @@ from searcher_interface import BaseIPTVSearcher, IPTVChannel, SearchConfig, Sear
 
 logger = logging.getLogger(__name__)
 
+# 频道名匹配用的预编译正则（每个tba候选都会调用，避免重复查找正则缓存）
+_NON_WORD_RE = re.compile(r'[^\w\d]')
+_CCTV_NUM_RE = re.compile(r'cctv[^\d]*(\d+)')
+
+# 分页l参数提取用的正则
+_HREF_RE = re.compile(r'<a\b[^>]*?\bhref\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+_L_PARAM_RE = re.compile(r'l=([a-f0-9]{8,12})', re.IGNORECASE)
+
+# 频道名称候选文本必须包含的特征词之一
+_CHANNEL_NAME_HINTS = ('cctv', 'tv', 'channel', 'live')
+
+# get_text()默认收集的文本节点类型（注释、脚本、样式等子类不计入）
+_VISIBLE_STRING_TYPES = (NavigableString, CData)
+
+# 流媒体链接支持和不支持的协议
+_SUPPORTED_PROTOCOLS = ('http://', 'https://', 'rtmp://')
+_UNSUPPORTED_PROTOCOLS = ('udp://', 'rtp://', 'rtsp://')
+
+# 流媒体链接校验用的正则
+_STREAM_FORMAT_RE = re.compile(r'\.(?:m3u8|ts|flv|mp4|mkv)')
+_STREAM_PORT_RE = re.compile(r':\d{2,5}/')
+
+# 分辨率查找用的正则，三种格式合并为一个分支，一次扫描完成
+_RESOLUTION_RE = re.compile(
+    r'(\d{3,4})[x×](\d{3,4})|(\d{3,4})[pP]|(4K|8K|HD|FHD|UHD)',
+    re.IGNORECASE
+)
+
+# 链接验证请求的重试策略：不重试失败的连接，只跟随重定向
+_VALIDATION_RETRY = Retry(total=5, connect=0, read=0, status=0)
+
+# HEAD探测：跳转状态码，以及最终响应视为有效的状态码（与跟随跳转时的判定一致）
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+_VALID_PROBE_STATUSES = (200, 206, 302, 301)
+
+
+@lru_cache(maxsize=1024)
+def _keyword_variants(keyword: str) -> Tuple[str, str, Optional[str]]:
+    """
+    预计算关键词的匹配形式 - 关键词来自固定的频道列表，每个只需计算一次
+    
+    Returns:
+        Tuple[str, str, Optional[str]]: (小写形式, 去除符号后的形式, CCTV频道号)
+    """
+    keyword_lower = keyword.lower().strip()
+    keyword_clean = _NON_WORD_RE.sub('', keyword_lower)
+    cctv_match = _CCTV_NUM_RE.search(keyword_lower)
+    return keyword_lower, keyword_clean, cctv_match.group(1) if cctv_match else None
+
+
+@lru_cache(maxsize=4096)
+def _channel_name_matches(channel_name: str, keyword: str) -> bool:
+    """
+    判断频道名称是否匹配关键词 - 同一页面上大量tba共用同一个频道名，按(名称, 关键词)缓存结果
+    """
+    channel_lower = channel_name.lower().strip()
+    keyword_lower, keyword_clean, keyword_cctv_num = _keyword_variants(keyword)
+    
+    # 精确匹配
+    if channel_lower == keyword_lower:
+        return True
+    
+    # 清理后匹配
+    channel_clean = _NON_WORD_RE.sub('', channel_lower)
+    if channel_clean == keyword_clean:
+        return True
+    
+    # CCTV特殊处理
+    if keyword_cctv_num is not None:
+        channel_num_match = _CCTV_NUM_RE.search(channel_lower)
+        if channel_num_match:
+            return keyword_cctv_num == channel_num_match.group(1)
+    
+    # 包含匹配（作为最后选择）
+    return keyword_lower in channel_lower
+
+
+def _match_resolution(text: str) -> Optional[str]:
+    """
+    在文本中查找分辨率，优先级: 宽x高 > 数字p > 4K/HD等标识
+    
+    Returns:
+        Optional[str]: 分辨率字符串，未找到时返回None
+    """
+    p_resolution = None
+    label_resolution = None
+    for match in _RESOLUTION_RE.finditer(text):
+        if match.group(1):
+            return f"{match.group(1)}x{match.group(2)}"
+        if match.group(3):
+            if p_resolution is None:
+                p_resolution = f"{match.group(3)}p"
+        elif label_resolution is None:
+            label_resolution = match.group(4)
+    
+    return p_resolution or label_resolution
+
+
+def _split_origin(url: str) -> Tuple[str, str]:
+    """把URL拆成 scheme://netloc 和其后的路径/参数部分"""
+    parts = urlsplit(url)
+    prefix_len = len(parts.scheme) + 3 + len(parts.netloc)
+    return url[:prefix_len], url[prefix_len:]
+
+
 class TonkiangSearcher(BaseIPTVSearcher):
     """Tonkiang.us IPTV搜索器"""
     
     def __init__(self, config: SearchConfig = None):
-        super().__init__(config)
+        # 会话和分页l参数按线程隔离：频道在线程池中并发搜索，共用一个会话会
+        # 互相清空请求头、轮换会话，l参数也会串到别的关键词的翻页请求里
+        self._thread_state = threading.local()
         self.site_name = "Tonkiang.us"
         self.base_url = "https://tonkiang.us"
-        self._setup_session()
+        super().__init__(config)  # 基类初始化时会调用_setup_session创建会话
         self._last_request_time = 0
-        self._current_l_param = None  # 存储当前搜索的l参数，用于分页
+        self._rate_lock = threading.Lock()  # 频率控制在所有线程间共享
         
         # 默认高效率配置
         self.min_delay = 3.0
@@ -61,6 +173,9 @@ class TonkiangSearcher(BaseIPTVSearcher):
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15',
                 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36'
             ]
+        
+        # 链接验证使用独立的连接池，不受搜索会话轮换影响
+        self._setup_validation_pool()
     
     def get_searcher_info(self) -> dict:
         """获取搜索器信息"""
@@ -70,15 +185,45 @@ class TonkiangSearcher(BaseIPTVSearcher):
             'description': 'Tonkiang.us IPTV搜索器'
         }
     
+    @property
+    def session(self) -> requests.Session:
+        """当前线程的HTTP会话，线程首次使用时创建"""
+        session = getattr(self._thread_state, 'session', None)
+        if session is None:
+            self._setup_session()
+            session = self._thread_state.session
+        return session
+    
+    @session.setter
+    def session(self, value: requests.Session):
+        self._thread_state.session = value
+    
+    @property
+    def current_session_requests(self) -> int:
+        """当前线程会话的请求计数"""
+        return getattr(self._thread_state, 'session_requests', 0)
+    
+    @current_session_requests.setter
+    def current_session_requests(self, value: int):
+        self._thread_state.session_requests = value
+    
+    @property
+    def _current_l_param(self) -> Optional[str]:
+        """当前线程正在搜索的关键词的l参数，用于分页"""
+        return getattr(self._thread_state, 'l_param', None)
+    
+    @_current_l_param.setter
+    def _current_l_param(self, value: Optional[str]):
+        self._thread_state.l_param = value
+    
     def _setup_session(self):
         """设置HTTP会话"""
         # 全局禁用SSL警告
-        import urllib3
-        import ssl
         urllib3.disable_warnings()
         
         self.session = requests.Session()
         self.current_session_requests = 0  # 当前会话请求计数
+        self._thread_state.last_response_time = None  # 新会话视为冷启动
         
         # 完全禁用SSL证书验证
         self.session.verify = False
@@ -87,10 +232,12 @@ class TonkiangSearcher(BaseIPTVSearcher):
         self.session.trust_env = False
         
         # 设置重试策略 - 减少重试次数和日志
+        # 第一页搜索是POST，urllib3默认不按状态码重试POST；搜索请求不改变服务器状态，可以安全重试
         retry_strategy = Retry(
             total=1,  # 减少重试次数
             backoff_factor=0.5,
             status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST']),
             raise_on_status=False  # 不抛出状态异常
         )
         
@@ -102,10 +249,13 @@ class TonkiangSearcher(BaseIPTVSearcher):
                 kwargs['ssl_context'].verify_mode = ssl.CERT_NONE
                 return super().init_poolmanager(*args, **kwargs)
         
+        # 会话按线程隔离，每个会话同一时间只有一个请求，目标只有站点域名（或直连IP）；
+        # 小连接池加阻塞模式即可保证连接复用，不会出现连接池满后丢弃连接、重新握手
         adapter = NoSSLAdapter(
             max_retries=retry_strategy,
-            pool_connections=50,
-            pool_maxsize=50
+            pool_connections=2,
+            pool_maxsize=2,
+            pool_block=True
         )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
@@ -144,27 +294,45 @@ class TonkiangSearcher(BaseIPTVSearcher):
         
         logger.info(f"[{self.site_name}] HTTP会话已配置")
     
+    def _setup_validation_pool(self):
+        """设置链接验证用的urllib3连接池 - 验证请求只需要原始HTTP复用，跳过requests的会话开销"""
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        
+        # 验证目标分散在大量不同的主机上，按主机保留多个连接池；
+        # 同一主机的连接数与验证并发数一致，避免多余连接用完即弃、重新握手
+        self._validation_pool = urllib3.PoolManager(
+            num_pools=50,
+            maxsize=min(self.config.concurrent_workers, 16),
+            block=False,
+            cert_reqs='CERT_NONE',
+            ssl_context=ssl_context,
+            headers={'User-Agent': self._get_random_user_agent()}
+        )
+        
+        # 整体迁移到其他主机的源站：原主机(scheme://netloc) -> 跳转后的主机，下次直接探测跳转后的地址
+        self._redirect_cache = {}
+    
     def _extract_l_parameter(self, html_content: str) -> Optional[str]:
         """从HTML内容中提取l参数 - 用于分页请求"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 从分页按钮链接中提取l参数
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
+            # 直接在原始HTML上扫描href属性，避免为此再构建一次完整的DOM树
+            for match in _HREF_RE.finditer(html_content):
+                href = match.group(1)
                 if 'page=2' in href and 'l=' in href:
                     # 提取8-12位的hex字符串
-                    match = re.search(r'l=([a-f0-9]{8,12})', href, re.IGNORECASE)
-                    if match:
-                        l_param = match.group(1)
-                        logger.debug(f"[{self.site_name}] 提取到l参数: {l_param}")
+                    l_match = _L_PARAM_RE.search(href)
+                    if l_match:
+                        l_param = l_match.group(1)
+                        logger.debug("[%s] 提取到l参数: %s", self.site_name, l_param)
                         return l_param
             
-            logger.debug(f"[{self.site_name}] 未找到l参数")
+            logger.debug("[%s] 未找到l参数", self.site_name)
             return None
             
         except Exception as e:
-            logger.debug(f"[{self.site_name}] 提取l参数异常: {e}")
+            logger.debug("[%s] 提取l参数异常: %s", self.site_name, e)
             return None
     
     def _get_random_user_agent(self) -> str:
@@ -173,11 +341,12 @@ class TonkiangSearcher(BaseIPTVSearcher):
     
     def _create_fresh_session(self):
         """创建全新的会话"""
-        logger.debug(f"[{self.site_name}] 创建新会话，重置反爬虫特征")
+        logger.debug("[%s] 创建新会话，重置反爬虫特征", self.site_name)
         
         # 关闭旧会话
-        if hasattr(self, 'session'):
-            self.session.close()
+        old_session = getattr(self._thread_state, 'session', None)
+        if old_session is not None:
+            old_session.close()
         
         # 重新设置会话
         self._setup_session()
@@ -232,31 +401,46 @@ class TonkiangSearcher(BaseIPTVSearcher):
             self.session.headers['Viewport-Width'] = str(viewport_width)
     
     def _random_delay(self, min_delay: float = 1.0, max_delay: float = 3.0):
-        """随机延迟"""
-        delay = random.uniform(min_delay, max_delay)
+        """
+        随机延迟 - 区间内截断的对数正态分布：多数停顿集中在区间中点附近，较长一侧略有拖尾，
+        比均匀分布更接近人工操作。超出区间的取值重新抽样而不是截到边界，避免大量停顿恰好等于边界值
+        """
+        median = (min_delay + max_delay) / 2
+        for _ in range(20):
+            delay = random.lognormvariate(math.log(median), 0.25)
+            if min_delay <= delay <= max_delay:
+                break
+        else:
+            # 区间过窄、连续抽样落空时退回均匀分布
+            delay = random.uniform(min_delay, max_delay)
         time.sleep(delay)
     
+    def _mark_request_time(self):
+        """记录请求完成时间，不覆盖其他线程已预留的更晚时间点"""
+        with self._rate_lock:
+            self._last_request_time = max(self._last_request_time, time.monotonic())
+    
     def _batch_delay(self):
         """批量处理延迟 - 增加延迟时间应对反爬虫"""
         delay = random.uniform(8.0, 15.0)  # 增加延迟时间
-        logger.debug(f"[{self.site_name}] 批量处理延迟 {delay:.1f}秒")
+        logger.debug("[%s] 批量处理延迟 %.1f秒", self.site_name, delay)
         time.sleep(delay)
     
     def _send_search_request(self, keyword: str, page: int = 1) -> Optional[str]:
         """发送搜索请求"""
         try:
-                # 频率控制 - 平衡的频率限制
-            if hasattr(self, '_last_request_time'):
-                time_since_last = time.time() - self._last_request_time
+            # 频率控制 - 平衡的频率限制
+            # 在锁内预留下一个请求时间点，并发线程依次排队，而不是同时醒来一起请求
+            with self._rate_lock:
+                time_since_last = time.monotonic() - self._last_request_time
                 min_interval = 6.0  # 适中的间隔时间
+                remaining_time = 0.0
                 if time_since_last < min_interval:
-                    remaining_time = min_interval - time_since_last
-                    logger.debug(f"[{self.site_name}] 频率控制等待 {remaining_time:.1f}秒")
-                    time.sleep(remaining_time + random.uniform(0.5, 1.5))  # 适中的随机延迟
-            
-            # 预热访问 - 适中延迟时间
-            self._random_delay(2.0, 4.0)
-            logger.debug(f"[{self.site_name}] 预热访问主页...")
+                    remaining_time = min_interval - time_since_last + random.uniform(0.5, 1.5)  # 适中的随机延迟
+                self._last_request_time = time.monotonic() + remaining_time
+            if remaining_time > 0:
+                logger.debug("[%s] 频率控制等待 %.1f秒", self.site_name, remaining_time)
+                time.sleep(remaining_time)
             
             # 模拟人类行为
             self._simulate_human_behavior()
@@ -271,12 +455,12 @@ class TonkiangSearcher(BaseIPTVSearcher):
                     ip = f"[{ip}]"
                 base_url = f"https://{ip}"
                 self.session.headers['Host'] = 'tonkiang.us'  # 设置Host头
-                logger.debug(f"[{self.site_name}] 使用直接IP访问: {ip}")
+                logger.debug("[%s] 使用直接IP访问: %s", self.site_name, ip)
             else:
                 base_url = self.base_url
             
             # **简化策略: 直接搜索，避免复杂逻辑导致的内容截断**
-            logger.debug(f"[{self.site_name}] 使用简化策略直接搜索: {keyword}")
+            logger.debug("[%s] 使用简化策略直接搜索: %s", self.site_name, keyword)
             
             # 设置基础请求头（纯ASCII避免编码问题）
             self.session.headers.clear()  # 清除所有可能有问题的头部
@@ -289,9 +473,13 @@ class TonkiangSearcher(BaseIPTVSearcher):
                 'Referer': 'https://tonkiang.us/'
             })
             
-            # 简单延迟
-            self._random_delay(2.0, 4.0)
-            logger.debug(f"[{self.site_name}] 发送搜索请求: {keyword}, 页面: {page}")
+            # 简单延迟 - 本线程会话5分钟内刚收到过响应时，只需短暂抖动
+            last_response_time = getattr(self._thread_state, 'last_response_time', None)
+            if last_response_time is not None and time.monotonic() - last_response_time < 300:
+                self._random_delay(0.3, 1.2)
+            else:
+                self._random_delay(2.0, 4.0)
+            logger.debug("[%s] 发送搜索请求: %s, 页面: %s", self.site_name, keyword, page)
             
             # 分页逻辑：第一页用POST，后续页面用GET
             try:
@@ -312,7 +500,7 @@ class TonkiangSearcher(BaseIPTVSearcher):
                         return None
                     
                     search_url = f"{base_url}/?page={page}&iptv={keyword}&l={self._current_l_param}"
-                    logger.debug(f"[{self.site_name}] 第{page}页GET请求URL: {search_url}")
+                    logger.debug("[%s] 第%s页GET请求URL: %s", self.site_name, page, search_url)
                     
                     # 设置第二页专用的请求头
                     headers = {
@@ -333,6 +521,7 @@ class TonkiangSearcher(BaseIPTVSearcher):
                 if response.encoding is None:
                     response.encoding = 'utf-8'
                 content = response.text
+                self._thread_state.last_response_time = time.monotonic()
                 
                 # 简化的响应检查
                 logger.info(f"[{self.site_name}] 状态码: {response.status_code}, 内容长度: {len(content)} 字符")
@@ -347,18 +536,19 @@ class TonkiangSearcher(BaseIPTVSearcher):
                         if page == 1:
                             self._current_l_param = self._extract_l_parameter(content)
                             if self._current_l_param:
-                                logger.debug(f"[{self.site_name}] 第一页成功提取l参数: {self._current_l_param}")
+                                logger.debug("[%s] 第一页成功提取l参数: %s", self.site_name, self._current_l_param)
                             else:
-                                logger.debug(f"[{self.site_name}] 第一页未能提取l参数")
+                                logger.debug("[%s] 第一页未能提取l参数", self.site_name)
                         
                         logger.info(f"[{self.site_name}] 搜索成功: {keyword}, 页面: {page}")
-                        self._last_request_time = time.time()
+                        self._mark_request_time()
                         return content
                     else:
                         logger.warning(f"[{self.site_name}] 内容质量检查失败: tba={has_tba}, keyword={has_keyword}")
-                        # 调试信息
-                        preview = content[:300] + "..." if len(content) > 300 else content
-                        logger.debug(f"[{self.site_name}] 内容预览: {repr(preview)}")
+                        # 调试信息 - 仅在开启DEBUG日志时才截取并转义预览内容
+                        if logger.isEnabledFor(logging.DEBUG):
+                            preview = content[:300] + "..." if len(content) > 300 else content
+                            logger.debug("[%s] 内容预览: %r", self.site_name, preview)
                 else:
                     logger.warning(f"[{self.site_name}] HTTP错误: {response.status_code}")
                 
@@ -369,7 +559,7 @@ class TonkiangSearcher(BaseIPTVSearcher):
             
         except Exception as e:
             logger.error(f"[{self.site_name}] 搜索请求异常: {keyword} - {e}")
-            self._last_request_time = time.time()
+            self._mark_request_time()
             return None
     
     def _parse_search_results(self, html_content: str, keyword: str) -> List[IPTVChannel]:
@@ -378,13 +568,14 @@ class TonkiangSearcher(BaseIPTVSearcher):
         
         if not html_content:
             return channels
-        
+
         try:
-            logger.debug(f"[{self.site_name}] 开始解析HTML内容，长度: {len(html_content)} 字符")
+            logger.debug("[%s] 开始解析HTML内容，长度: %s 字符", self.site_name, len(html_content))
             
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, 'lxml')
             tba_elements = soup.find_all('tba')
-            logger.debug(f"[{self.site_name}] 找到 {len(tba_elements)} 个流媒体链接")
+            logger.debug("[%s] 找到 %s 个流媒体链接", self.site_name, len(tba_elements))
+            context_cache = {}
             
             for tba in tba_elements:
                 try:
@@ -393,8 +584,8 @@ class TonkiangSearcher(BaseIPTVSearcher):
                     if not self._is_valid_stream_url(stream_url):
                         continue
                     
-                    # 查找频道名称
-                    channel_name = self._find_channel_name_near_tba(tba, keyword)
+                    # 查找频道名称和分辨率（一次上溯同时完成）
+                    channel_name, resolution = self._find_context_near_tba(tba, context_cache)
                     
                     # 如果是中文关键词且没找到频道名，使用搜索关键词作为频道名
                     if not channel_name and any(ord(char) > 127 for char in keyword):
@@ -404,12 +595,9 @@ class TonkiangSearcher(BaseIPTVSearcher):
                     
                     # 验证名称匹配
                     if not self._is_channel_match(channel_name, keyword):
-                        logger.debug(f"[{self.site_name}] 过滤: '{channel_name}' 不匹配 '{keyword}'")
+                        logger.debug("[%s] 过滤: '%s' 不匹配 '%s'", self.site_name, channel_name, keyword)
                         continue
                     
-                    # 查找分辨率
-                    resolution = self._find_resolution_near_tba(tba)
-                    
                     # 创建频道对象
                     channel = IPTVChannel(
                         name=keyword,
@@ -418,10 +606,10 @@ class TonkiangSearcher(BaseIPTVSearcher):
                         source=self.site_name
                     )
                     channels.append(channel)
-                    logger.debug(f"[{self.site_name}] 添加频道: {keyword} [{resolution}]")
+                    logger.debug("[%s] 添加频道: %s [%s]", self.site_name, keyword, resolution)
                     
                 except Exception as e:
-                    logger.debug(f"[{self.site_name}] 解析单个tba异常: {e}")
+                    logger.debug("[%s] 解析单个tba异常: %s", self.site_name, e)
                     continue
             
             logger.info(f"[{self.site_name}] 解析完成: {keyword}, 找到 {len(channels)} 个频道")
@@ -436,136 +624,113 @@ class TonkiangSearcher(BaseIPTVSearcher):
         if not url or len(url) < 10:
             return False
         
+        # 快速拒绝：有效链接只能以http/https/rtmp开头，首字符不符时无需转小写和后续扫描
+        if url[0] not in 'hHrR':
+            return False
+        
         url_lower = url.lower()
         
         # 过滤不支持的协议
-        invalid_protocols = ['udp://', 'rtp://', 'rtsp://']
-        for protocol in invalid_protocols:
-            if protocol in url_lower:
-                logger.debug(f"[{self.site_name}] 跳过不支持的协议: {url[:50]}...")
-                return False
+        if any(protocol in url_lower for protocol in _UNSUPPORTED_PROTOCOLS):
+            logger.debug("[%s] 跳过不支持的协议: %s...", self.site_name, url[:50])
+            return False
         
         # 检查协议
-        if not re.match(r'^(https?|rtmp)://', url, re.IGNORECASE):
+        if not url_lower.startswith(_SUPPORTED_PROTOCOLS):
             return False
         
         # IPv6地址检查
         if '[' in url and ']:' in url:
-            logger.debug(f"[{self.site_name}] 检测到IPv6地址: {url[:50]}...")
+            logger.debug("[%s] 检测到IPv6地址: %s...", self.site_name, url[:50])
         
         # 检查流媒体格式或端口
-        stream_formats = ['.m3u8', '.ts', '.flv', '.mp4', '.mkv']
-        has_format = any(fmt in url_lower for fmt in stream_formats)
-        has_port = re.search(r':\d{2,5}/', url)
+        has_format = _STREAM_FORMAT_RE.search(url_lower)
+        has_port = _STREAM_PORT_RE.search(url)
         
         return has_format or has_port
     
-    def _find_channel_name_near_tba(self, tba_element, keyword: str) -> Optional[str]:
-        """在tba元素附近查找频道名称"""
+    def _find_context_near_tba(self, tba_element, context_cache: Optional[dict] = None) -> Tuple[Optional[str], str]:
+        """
+        在tba元素附近查找频道名称和分辨率
+        
+        两者都从tba向上逐层查找：频道名最多上溯5层，分辨率最多3层。
+        合并为一次上溯，每层的文本节点只收集一次，两种查找共用
+        
+        Args:
+            tba_element: tba元素
+            context_cache: 本次解析内共用的容器查找结果缓存，键为容器的id
+            
+        Returns:
+            Tuple[Optional[str], str]: (频道名称，未找到时为None; 分辨率，未找到时为默认值)
+        """
+        channel_name = None
+        resolution = None
         try:
-            # 向上查找父级容器
-            for level in range(1, 6):
-                parent = tba_element
-                for _ in range(level):
-                    parent = parent.parent
-                    if not parent:
-                        break
-                
+            parent = tba_element
+            for level in range(5):
+                parent = parent.parent
                 if not parent:
-                    continue
+                    break
                 
-                # 在父级容器中查找文本
-                texts = []
-                for elem in parent.find_all(text=True):
-                    text = elem.strip()
-                    if text and len(text) > 1:
-                        texts.append(text)
+                need_name = channel_name is None
+                need_resolution = resolution is None and level < 3
+                if not need_name and not need_resolution:
+                    break
                 
-                # 查找匹配的频道名称
-                potential_names = []
-                for text in texts:
-                    if len(text) > 50:
-                        continue
-                    if any(x in text.lower() for x in ['http', '.m3u8', '.ts', 'onclick', 'copy', 'play']):
-                        continue
-                    if any(pattern in text.lower() for pattern in ['cctv', 'tv', 'channel', 'live']):
-                        potential_names.append(text)
+                # 同一结果卡片内的tba共享上层容器，每个容器在一次解析内只扫描一次
+                if context_cache is None:
+                    level_name, level_resolution = self._scan_container(parent)
+                else:
+                    key = id(parent)
+                    cached = context_cache.get(key)
+                    if cached is None:
+                        cached = context_cache[key] = self._scan_container(parent)
+                    level_name, level_resolution = cached
                 
-                if potential_names:
-                    return potential_names[0]
-            
-            return None
+                if need_name:
+                    channel_name = level_name
+                if need_resolution:
+                    resolution = level_resolution
             
         except Exception as e:
-            logger.debug(f"[{self.site_name}] 查找频道名称异常: {e}")
-            return None
+            logger.debug("[%s] 查找频道上下文异常: %s", self.site_name, e)
+        
+        return channel_name, resolution or "1920x1080"  # 默认分辨率
     
-    def _find_resolution_near_tba(self, tba_element) -> str:
-        """查找分辨率信息"""
-        try:
-            # 在附近查找分辨率信息
-            for level in range(1, 4):
-                parent = tba_element
-                for _ in range(level):
-                    parent = parent.parent
-                    if not parent:
-                        break
-                
-                if not parent:
-                    continue
-                
-                parent_text = parent.get_text()
-                
-                # 查找分辨率模式
-                resolution_patterns = [
-                    r'(\d{3,4})[x×](\d{3,4})',
-                    r'(\d{3,4})[pP]',
-                    r'(4K|8K|HD|FHD|UHD)',
-                ]
-                
-                for pattern in resolution_patterns:
-                    match = re.search(pattern, parent_text, re.IGNORECASE)
-                    if match:
-                        if 'x' in pattern or '×' in pattern:
-                            return f"{match.group(1)}x{match.group(2)}"
-                        elif 'p' in pattern.lower():
-                            return f"{match.group(1)}p"
-                        else:
-                            return match.group(1)
-            
-            return "1920x1080"  # 默认分辨率
-            
-        except Exception:
-            return "1920x1080"
+    def _scan_container(self, container) -> Tuple[Optional[str], Optional[str]]:
+        """收集容器内的文本节点，查找其中的频道名称和分辨率"""
+        strings = container.find_all(text=True)
+        
+        # 整层文本都不含频道名特征词时，逐个文本节点检查必然落空，直接跳过
+        channel_name = None
+        joined_lower = ''.join(strings).lower()
+        if any(hint in joined_lower for hint in _CHANNEL_NAME_HINTS):
+            channel_name = self._pick_channel_name(strings)
+        
+        # 分辨率只在可见文本中查找，与get_text()一致：排除注释、<script>/<style>等节点的内容
+        visible_text = ''.join(text for text in strings if type(text) in _VISIBLE_STRING_TYPES)
+        return channel_name, _match_resolution(visible_text)
+    
+    @staticmethod
+    def _pick_channel_name(strings) -> Optional[str]:
+        """从一层容器的文本节点中挑选第一个像频道名称的文本"""
+        for elem in strings:
+            text = elem.strip()
+            if len(text) <= 1 or len(text) > 50:
+                continue
+            text_lower = text.lower()
+            if any(x in text_lower for x in ['http', '.m3u8', '.ts', 'onclick', 'copy', 'play']):
+                continue
+            if any(pattern in text_lower for pattern in _CHANNEL_NAME_HINTS):
+                return text
+        return None
     
     def _is_channel_match(self, channel_name: str, keyword: str) -> bool:
         """检查频道名称是否匹配关键词"""
         if not channel_name or not keyword:
             return False
         
-        channel_lower = channel_name.lower().strip()
-        keyword_lower = keyword.lower().strip()
-        
-        # 精确匹配
-        if channel_lower == keyword_lower:
-            return True
-        
-        # 清理后匹配
-        channel_clean = re.sub(r'[^\w\d]', '', channel_lower)
-        keyword_clean = re.sub(r'[^\w\d]', '', keyword_lower)
-        if channel_clean == keyword_clean:
-            return True
-        
-        # CCTV特殊处理
-        if 'cctv' in keyword_lower:
-            keyword_num_match = re.search(r'cctv[^\d]*(\d+)', keyword_lower)
-            channel_num_match = re.search(r'cctv[^\d]*(\d+)', channel_lower)
-            
-            if keyword_num_match and channel_num_match:
-                return keyword_num_match.group(1) == channel_num_match.group(1)
-        
-        # 包含匹配（作为最后选择）
-        return keyword_lower in channel_lower
+        return _channel_name_matches(channel_name, keyword)
     
     def _validate_link(self, channel: IPTVChannel) -> bool:
         """验证链接有效性"""
@@ -575,7 +740,7 @@ class TonkiangSearcher(BaseIPTVSearcher):
         try:
             # IPv6地址宽松验证
             if '[' in channel.url and ']:' in channel.url:
-                logger.debug(f"[{self.site_name}] IPv6地址，降低验证标准: {channel.url[:50]}...")
+                logger.debug("[%s] IPv6地址，降低验证标准: %s...", self.site_name, channel.url[:50])
                 try:
                     timeout = 1
                     if '.m3u8' in channel.url.lower():
@@ -583,7 +748,7 @@ class TonkiangSearcher(BaseIPTVSearcher):
                     else:
                         return self._validate_stream_basic(channel.url, timeout)
                 except:
-                    logger.debug(f"[{self.site_name}] IPv6链接验证失败，但保留链接: {channel.url[:50]}...")
+                    logger.debug("[%s] IPv6链接验证失败，但保留链接: %s...", self.site_name, channel.url[:50])
                     return True
             
             # 常规验证 - 减少超时时间
@@ -593,21 +758,37 @@ class TonkiangSearcher(BaseIPTVSearcher):
             return self._validate_stream_basic(channel.url, timeout)
             
         except Exception as e:
-            logger.debug(f"[{self.site_name}] 链接验证异常: {channel.url}: {e}")
+            logger.debug("[%s] 链接验证异常: %s: %s", self.site_name, channel.url, e)
             return False
     
     def _validate_m3u8_quality(self, url: str, timeout: int) -> bool:
         """验证M3U8流质量"""
         try:
-            # 简化验证，只检查M3U8文件本身
-            response = self.session.get(url, timeout=timeout)
-            if response.status_code != 200:
-                return False
-            
-            content = response.text[:5000]  # 只读取前5KB
+            # 简化验证，只检查M3U8文件本身；用Range只请求前5KB，流式读取
+            # 传入headers会替换连接池的默认请求头，需要合并进User-Agent
+            headers = dict(self._validation_pool.headers, Range='bytes=0-4999')
+            response = self._validation_pool.request(
+                'GET', url, headers=headers, timeout=timeout, retries=_VALIDATION_RETRY, preload_content=False
+            )
+            try:
+                if response.status == 206:
+                    # 服务器按Range只返回了前5KB，直接读完，连接可以放回池中复用
+                    content = response.read()
+                elif response.status == 200:
+                    # 服务器忽略了Range：#EXTM3U是播放列表的首行，先读一小段，命中即可结束；否则再读满5KB窗口
+                    content = response.read(512)
+                    if b'#EXTM3U' not in content:
+                        content += response.read(5000 - len(content))
+                else:
+                    return False
+            finally:
+                # 未读完的响应直接关闭连接，读完的连接放回池中复用
+                if not response.closed:
+                    response.close()
+                response.release_conn()
             
             # 检查是否为有效的M3U8
-            if '#EXTM3U' not in content:
+            if b'#EXTM3U' not in content:
                 return False
             
             return True
@@ -615,15 +796,46 @@ class TonkiangSearcher(BaseIPTVSearcher):
         except Exception:
             return False
     
-
-    
     def _validate_stream_basic(self, url: str, timeout: int) -> bool:
-        """基本流验证"""
+        """
+        基本流验证 - 只做HEAD请求，避免下载数据
+        
+        跳转响应不直接视为有效，继续验证跳转目标。若跳转只是把整个源站换到另一个主机
+        （路径和参数不变），按主机记住跳转后的地址，同一主机的其他链接直接探测目标，省去一次往返
+        """
         try:
-            # 只做HEAD请求，避免下载数据
-            response = self.session.head(url, timeout=timeout, allow_redirects=True)
-            return response.status_code in [200, 206, 302, 301]
+            origin, rest = _split_origin(url)
+            
+            cached_origin = self._redirect_cache.get(origin)
+            if cached_origin:
+                if self._probe_head(cached_origin + rest, timeout):
+                    return True
+                # 跳转目标已失效或已变化，丢弃记录，按原地址重新验证
+                self._redirect_cache.pop(origin, None)
             
+            response = self._validation_pool.request(
+                'HEAD', url, timeout=timeout, retries=_VALIDATION_RETRY, redirect=False
+            )
+            location = response.headers.get('Location')
+            if response.status in _REDIRECT_STATUSES and location:
+                target = urljoin(url, location)
+                target_origin, target_rest = _split_origin(target)
+                if target_rest == rest and target_origin != origin:
+                    self._redirect_cache[origin] = target_origin
+                return self._probe_head(target, timeout)
+            
+            return response.status in _VALID_PROBE_STATUSES
+            
+        except Exception:
+            return False
+    
+    def _probe_head(self, url: str, timeout: int) -> bool:
+        """HEAD探测，跟随后续跳转，按最终响应判断是否有效"""
+        try:
+            response = self._validation_pool.request(
+                'HEAD', url, timeout=timeout, retries=_VALIDATION_RETRY
+            )
+            return response.status in _VALID_PROBE_STATUSES
         except Exception:
             return False
     
@@ -634,7 +846,7 @@ class TonkiangSearcher(BaseIPTVSearcher):
         """
         # 重置l参数，为新的搜索做准备
         self._current_l_param = None
-        logger.debug(f"[{self.site_name}] 开始新搜索，重置l参数: {keyword}")
+        logger.debug("[%s] 开始新搜索，重置l参数: %s", self.site_name, keyword)
         
         # 调用基类的search_channels方法
         return super().search_channels(keyword)
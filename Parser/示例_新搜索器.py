@@ -6,10 +6,12 @@
 """
 
 import requests
+import json
 import re
-import time
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from typing import List
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 
 # 导入搜索器接口
@@ -17,6 +19,18 @@ from searcher_interface import BaseIPTVSearcher, IPTVChannel, SearchConfig, Sear
 
 logger = logging.getLogger(__name__)
 
+# 解析用的预编译正则，避免每次解析都重新查找正则缓存
+_STREAM_HREF_RE = re.compile(r'\.(m3u8|ts|flv)')
+# 只构建指向流媒体文件的<a>标签，页面其余部分不生成节点
+_STREAM_LINK_STRAINER = SoupStrainer('a', href=_STREAM_HREF_RE)
+_P_RESOLUTION_RE = re.compile(r'(\d+)p')
+# 多种格式合并为一个分支正则，只扫描一遍HTML
+_STREAM_URL_RE = re.compile(r'(https?://[^\s<>"\']+\.(?:m3u8|ts)[^\s<>"\']*)', re.IGNORECASE)
+# URL有效性检查：流媒体格式（忽略大小写，免去URL转小写）
+_STREAM_EXT_RE = re.compile(r'\.(?:m3u8|ts|flv|mp4)', re.IGNORECASE)
+# 链接验证接受的Content-Type
+_VALID_CONTENT_TYPES = ('application/vnd.apple.mpegurl', 'video/', 'application/octet-stream')
+
 
 class ExampleSearcher(BaseIPTVSearcher):
     """
@@ -42,6 +56,16 @@ class ExampleSearcher(BaseIPTVSearcher):
             'Referer': f'{self.base_url}/',
         })
         
+        # 显式配置连接池：链接验证会在多个线程中并发访问大量不同主机，
+        # 默认每个主机只保留10个连接，超出验证并发数时连接会被丢弃、重新握手
+        adapter = HTTPAdapter(
+            pool_connections=50,
+            pool_maxsize=min(self.config.concurrent_workers, 16),
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         logger.info(f"[{self.site_name}] HTTP会话已配置")
     
     def _send_search_request(self, keyword: str, page: int = 1) -> str:
@@ -105,41 +129,50 @@ class ExampleSearcher(BaseIPTVSearcher):
         - 嵌入的JavaScript数据
         """
         channels = []
+        # 记录已生成频道的链接，同一链接多次出现时只生成一次，减少后续验证请求
+        seen_urls = set()
         
         try:
             # 方法1: 如果返回JSON数据
             if html_content.strip().startswith('{'):
-                import json
                 data = json.loads(html_content)
                 
                 # 根据JSON结构提取数据
                 if 'results' in data:
                     for item in data['results']:
+                        url = item.get('stream_url', '')
+                        if not url or url in seen_urls:
+                            continue
+                        seen_urls.add(url)
+                        
                         channel = IPTVChannel(
                             name=item.get('title', keyword),
-                            url=item.get('stream_url', ''),
+                            url=url,
                             resolution=item.get('quality', '未知'),
                             source=self.site_name
                         )
-                        
-                        if channel.url:
-                            channels.append(channel)
+                        channels.append(channel)
             
             else:
                 # 方法2: 解析HTML内容
-                soup = BeautifulSoup(html_content, 'html.parser')
+                soup = BeautifulSoup(html_content, 'lxml', parse_only=_STREAM_LINK_STRAINER)
                 
                 # 示例：查找包含链接的元素
                 # 具体选择器根据目标站点的HTML结构调整
-                link_elements = soup.find_all('a', href=re.compile(r'\.(m3u8|ts|flv)'))
+                link_elements = soup.find_all('a', href=_STREAM_HREF_RE)
                 
                 for element in link_elements:
                     url = element.get('href', '')
-                    title = element.get_text(strip=True) or keyword
-                    
+                    if url in seen_urls:
+                        continue
+                    # 只遍历一次子树获取文本节点，标题和分辨率共用；
+                    # 标题与get_text(strip=True)一致，分辨率在未去空白的原文上匹配，避免相邻节点的数字连在一起
+                    parts = list(element.strings)
+                    title = ''.join(part.strip() for part in parts) or keyword
+
                     # 提取分辨率信息（如果有）
                     resolution = "未知"
-                    resolution_match = re.search(r'(\d+)p', element.get_text())
+                    resolution_match = _P_RESOLUTION_RE.search(''.join(parts))
                     if resolution_match:
                         resolution = resolution_match.group(1) + 'p'
                     
@@ -151,26 +184,22 @@ class ExampleSearcher(BaseIPTVSearcher):
                     )
                     
                     channels.append(channel)
+                    seen_urls.add(url)
                 
-                # 方法3: 使用正则表达式直接提取链接
-                url_patterns = [
-                    r'(https?://[^\s<>"\']+\.m3u8[^\s<>"\']*)',
-                    r'(https?://[^\s<>"\']+\.ts[^\s<>"\']*)',
-                    # 添加更多模式...
-                ]
-                
-                for pattern in url_patterns:
-                    matches = re.finditer(pattern, html_content, re.IGNORECASE)
-                    for match in matches:
-                        url = match.group(1)
-                        if self._is_valid_url(url):
-                            channel = IPTVChannel(
-                                name=keyword,
-                                url=url,
-                                resolution="未知",
-                                source=self.site_name
-                            )
-                            channels.append(channel)
+                # 方法3: 使用正则表达式补充提取<a>标签以外的链接
+                for match in _STREAM_URL_RE.finditer(html_content):
+                    url = match.group(1)
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    if self._is_valid_url(url):
+                        channel = IPTVChannel(
+                            name=keyword,
+                            url=url,
+                            resolution="未知",
+                            source=self.site_name
+                        )
+                        channels.append(channel)
             
             logger.info(f"[{self.site_name}] 解析完成: {keyword}, 找到 {len(channels)} 个链接")
             
@@ -204,13 +233,12 @@ class ExampleSearcher(BaseIPTVSearcher):
             if response.status_code in [200, 206, 302, 301]:
                 # 可选：检查Content-Type
                 content_type = response.headers.get('Content-Type', '').lower()
-                valid_types = ['application/vnd.apple.mpegurl', 'video/', 'application/octet-stream']
                 
-                if any(vtype in content_type for vtype in valid_types) or not content_type:
+                if any(vtype in content_type for vtype in _VALID_CONTENT_TYPES) or not content_type:
                     return True
             
         except Exception as e:
-            logger.debug(f"[{self.site_name}] 链接验证失败 {channel.url}: {e}")
+            logger.debug("[%s] 链接验证失败 %s: %s", self.site_name, channel.url, e)
         
         return False
     
@@ -224,8 +252,7 @@ class ExampleSearcher(BaseIPTVSearcher):
             return False
         
         # 检查是否包含流媒体格式
-        stream_extensions = ['.m3u8', '.ts', '.flv', '.mp4']
-        return any(ext in url.lower() for ext in stream_extensions)
+        return _STREAM_EXT_RE.search(url) is not None
 
 
 class AnotherExampleSearcher(BaseIPTVSearcher):
@@ -249,6 +276,15 @@ class AnotherExampleSearcher(BaseIPTVSearcher):
             'X-API-Key': 'your-api-key-if-needed',  # 如果需要API密钥
             'Accept': 'application/json',
         })
+        
+        # API请求只访问一个主机，保持连接复用并对网关错误做少量重试
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def _send_search_request(self, keyword: str, page: int = 1) -> str:
         """API风格的搜索请求"""
@@ -278,21 +314,24 @@ class AnotherExampleSearcher(BaseIPTVSearcher):
     def _parse_search_results(self, json_content: str, keyword: str) -> List[IPTVChannel]:
         """解析JSON API响应"""
         channels = []
+        seen_urls = set()
         
         try:
-            import json
             data = json.loads(json_content)
             
             for item in data.get('channels', []):
+                url = item.get('stream_url', '')
+                if not url or url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                
                 channel = IPTVChannel(
                     name=item.get('name', keyword),
-                    url=item.get('stream_url', ''),
+                    url=url,
                     resolution=f"{item.get('resolution', {}).get('height', 0)}p",
                     source=self.site_name
                 )
-                
-                if channel.url:
-                    channels.append(channel)
+                channels.append(channel)
                     
         except Exception as e:
             logger.error(f"[{self.site_name}] JSON解析失败: {e}")